@@ -1,14 +1,21 @@
 """Python runtime adapter implementing v0.1 target semantics."""
 
 import ast
+import copy
 import importlib
+import importlib.util
 import inspect
+import os
+import textwrap
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal
 
 from carron.interfaces.adapter import (
     Adapter,
+    AdapterError,
     InvalidSourceError,
     TargetParseError,
     TargetRef,
@@ -17,6 +24,24 @@ from carron.interfaces.adapter import (
 
 SourceKind = Literal["module", "file"]
 ObjectKind = Literal["function", "method", "unknown"]
+DefNode = ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 2000
+_CHARS_PER_TOKEN = 4
+_SLICE_SEPARATOR = "\n\n"
+
+_WILDCARD = "*"
+_PARALLEL_SCAN_THRESHOLD = 16
+_SKIPPED_DIRS = {"__pycache__", "node_modules"}
+
+
+@dataclass(frozen=True)
+class _FileFingerprint:
+    """Identity of a source file revision used as a cache key."""
+
+    path: str
+    mtime_ns: int
+    size: int
 
 
 @dataclass(frozen=True)
@@ -43,6 +68,30 @@ class PythonTargetSummary:
     diagnostics: list[str]
 
 
+@dataclass(frozen=True)
+class PythonContextSlice:
+    """Minimal source context for a Python target, trimmed to a token budget.
+
+    ``source`` is the target's own source. ``imports`` and ``references``
+    hold the module-level imports and the signature/docstring stubs of the
+    definitions the target refers to, in priority order.
+    """
+
+    source: str
+    imports: list[str]
+    references: list[str]
+    token_estimate: int
+    truncated: bool
+    diagnostics: list[str]
+
+    def render(self) -> str:
+        """Return the slice as a single prompt-ready source block."""
+        parts = [*self.imports, *self.references]
+        if self.source:
+            parts.append(self.source)
+        return _SLICE_SEPARATOR.join(parts)
+
+
 @dataclass(frozen=True)
 class PythonValidatedTarget:
     """Validated Python target payload passed to forges."""
@@ -51,6 +100,55 @@ class PythonValidatedTarget:
     payload: Any
 
 
+def _read_source(path: str) -> tuple[str, ast.Module]:
+    """Read, decode and parse a Python file.
+
+    Decoding honours PEP 263 coding declarations. I/O, decoding and parse
+    failures are all raised as adapter errors.
+    """
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError as exc:
+        raise TargetResolutionError(f"File not found: {path}") from exc
+    except OSError as exc:
+        raise TargetResolutionError(f"Cannot read {path}: {exc.strerror or exc}") from exc
+
+    try:
+        source = importlib.util.decode_source(data)
+        tree = ast.parse(source, filename=path)
+    except SyntaxError as exc:
+        location = f" (line {exc.lineno})" if exc.lineno is not None else ""
+        raise InvalidSourceError(f"Invalid Python in {path}: {exc.msg}{location}") from exc
+    except ValueError as exc:  # Includes UnicodeDecodeError
+        raise InvalidSourceError(f"Invalid Python in {path}: {exc}") from exc
+
+    return source, tree
+
+
+def _scan_file(path: str) -> tuple[list[str], AdapterError | None]:
+    """Return the public function and method qualnames defined in a file.
+
+    Runs in worker processes, so failures are returned rather than raised.
+    """
+    try:
+        _, tree = _read_source(path)
+    except AdapterError as exc:
+        return [], exc
+
+    qualnames: list[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            qualnames.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            qualnames.extend(
+                f"{node.name}.{child.name}"
+                for child in node.body
+                if isinstance(child, ast.FunctionDef | ast.AsyncFunctionDef)
+            )
+    public = [name for name in qualnames if not any(p.startswith("_") for p in name.split("."))]
+    return public, None
+
+
 class PythonRuntimeAdapter(Adapter):
     """Python adapter implementing v0.1 runtime behavior.
 
@@ -61,10 +159,25 @@ class PythonRuntimeAdapter(Adapter):
     - file.py:func
     - file.py:Class.method
 
+    Wildcard forms expand to every public function and method:
+
+    - module:* / file.py:*
+    - module:Class.* / file.py:Class.*
+    - directory/ (all ``.py`` files beneath it, as file targets)
+
     File targets are resolved via read + AST.
     Module targets are resolved via import + inspect.
+
+    Parsed source files, wildcard scans and computed context slices are
+    cached in memory, keyed by file fingerprint (path, mtime, size).
     """
 
+    def __init__(self, *, context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET) -> None:
+        self._context_token_budget = context_token_budget
+        self._file_cache: dict[str, tuple[_FileFingerprint, str, ast.Module]] = {}
+        self._slice_cache: dict[tuple[_FileFingerprint, str, int], PythonContextSlice] = {}
+        self._scan_cache: dict[str, tuple[_FileFingerprint, list[str]]] = {}
+
     def get_target_summary(self, ref: TargetRef) -> PythonTargetSummary:
         """Return a best-effort summary of a Python target."""
         target = self._parse(ref.raw)
@@ -143,6 +256,121 @@ class PythonRuntimeAdapter(Adapter):
 
         return PythonValidatedTarget(target=target, payload={"object": obj})
 
+    def expand_target(
+        self, ref: TargetRef, diagnostics: list[str] | None = None
+    ) -> list[TargetRef]:
+        """Expand a wildcard or directory target into concrete targets.
+
+        Non-wildcard targets are returned unchanged. Wildcards match public
+        functions and methods only (no leading underscore). Files are scanned
+        via AST without importing them; uncached files are scanned in parallel
+        worker processes when there are enough of them.
+
+        Directory expansion is best-effort: unreadable or invalid files are
+        skipped and reported in ``diagnostics``. For an explicit
+        ``file.py:*`` or ``module:*`` target they raise instead.
+        """
+        raw = ref.raw.strip()
+
+        if raw.endswith(("/", os.sep)):
+            root = Path(raw)
+            if not root.is_dir():
+                raise TargetResolutionError(f"Directory not found: {raw}")
+            files = sorted(
+                str(path)
+                for path in root.rglob("*.py")
+                if not _SKIPPED_DIRS.intersection(path.relative_to(root).parts[:-1])
+                and not any(part.startswith(".") for part in path.relative_to(root).parts)
+            )
+            scanned = self._scan_files(files, errors=[] if diagnostics is None else diagnostics)
+            return [
+                TargetRef(raw=f"{path}:{name}") for path in files for name in scanned.get(path, [])
+            ]
+
+        if ":" not in raw:
+            return [ref]
+
+        locator, qualname = (part.strip() for part in raw.split(":", 1))
+        if qualname == _WILDCARD:
+            prefix = ""
+        elif qualname.endswith(f".{_WILDCARD}") and qualname.count(".") == 1:
+            prefix = qualname[: -len(_WILDCARD)]
+        else:
+            return [ref]
+
+        target = self._parse(f"{locator}:{_WILDCARD}")
+        path = self._source_path(target)
+        if path is None:
+            raise TargetResolutionError(f"No Python source available for '{locator}'")
+
+        names = self._scan_files([path])[path]
+        if prefix and not any(name.startswith(prefix) for name in names):
+            raise TargetResolutionError(f"Class '{prefix[:-1]}' not found or has no methods")
+        return [TargetRef(raw=f"{locator}:{name}") for name in names if name.startswith(prefix)]
+
+    def export_scan_cache(self) -> dict[str, dict[str, Any]]:
+        """Return the wildcard scan cache as JSON-serializable data.
+
+        The adapter never writes files itself; callers may persist this and
+        hand it back to ``import_scan_cache`` in a later process.
+        """
+        return {
+            path: {"mtime_ns": fp.mtime_ns, "size": fp.size, "names": names}
+            for path, (fp, names) in self._scan_cache.items()
+        }
+
+    def import_scan_cache(self, data: Mapping[str, Any]) -> None:
+        """Seed the wildcard scan cache from ``export_scan_cache`` data.
+
+        Malformed entries are ignored; stale entries are rescanned on use.
+        """
+        for path, entry in data.items():
+            try:
+                fingerprint = _FileFingerprint(
+                    path=path, mtime_ns=int(entry["mtime_ns"]), size=int(entry["size"])
+                )
+                names = [str(name) for name in entry["names"]]
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._scan_cache[path] = (fingerprint, names)
+
+    def get_context_slice(
+        self, ref: TargetRef, *, token_budget: int | None = None
+    ) -> PythonContextSlice:
+        """Return the minimal source context needed to describe a target.
+
+        The slice contains the target's source, stubs (signature and
+        docstring) of the module-level functions, classes and sibling
+        methods it references, and the imports binding the names it uses.
+        Stubs and imports are dropped once the token budget is exhausted;
+        the target's own source is always kept.
+
+        Module targets are sliced from their source file without importing
+        them. Targets without Python source yield an empty slice with
+        diagnostics rather than raising.
+        """
+        target = self._parse(ref.raw)
+        budget = self._context_token_budget if token_budget is None else token_budget
+
+        path = self._source_path(target)
+        if path is None:
+            return self._empty_slice(f"No Python source available for '{target.locator}'")
+
+        fingerprint, source, tree = self._load_source(path)
+        key = (fingerprint, target.qualname, budget)
+        cached = self._slice_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            node = self._find_node(tree, target)
+        except TargetResolutionError as exc:
+            return self._empty_slice(f"Definition not found in {path}: {exc}")
+
+        result = self._build_slice(source, tree, node, target, budget)
+        self._slice_cache[key] = result
+        return result
+
     def _parse(self, raw: str) -> _PythonTarget:
         """Parse a raw Python target string."""
         if ":" not in raw:
@@ -177,17 +405,255 @@ class PythonRuntimeAdapter(Adapter):
 
     def _parse_file_ast(self, path: str) -> ast.Module:
         """Read and parse a Python file into an AST."""
+        return self._load_source(path)[2]
+
+    def _source_path(self, target: _PythonTarget) -> str | None:
+        """Return the source file backing a target, if there is one."""
+        if target.source_kind == "file":
+            return target.locator
+
+        try:
+            spec = importlib.util.find_spec(target.locator)
+        except Exception:  # Best-effort by design
+            return None
+
+        origin = spec.origin if spec is not None else None
+        if origin is None or not origin.endswith(".py"):
+            return None
+        return origin
+
+    def _load_source(self, path: str) -> tuple[_FileFingerprint, str, ast.Module]:
+        """Read and parse a source file, reusing the cached parse if unchanged."""
+        fingerprint = self._fingerprint(path)
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached
+
+        source, tree = _read_source(path)
+        entry = (fingerprint, source, tree)
+        self._file_cache[path] = entry
+        return entry
+
+    def _fingerprint(self, path: str) -> _FileFingerprint:
+        """Return the current fingerprint of a file."""
         try:
-            source = Path(path).read_text()
+            stat = Path(path).stat()
         except FileNotFoundError as exc:
             raise TargetResolutionError(f"File not found: {path}") from exc
+        except OSError as exc:
+            raise TargetResolutionError(f"Cannot read {path}: {exc.strerror or exc}") from exc
+        return _FileFingerprint(path=path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+    def _scan_files(
+        self, paths: list[str], *, errors: list[str] | None = None
+    ) -> dict[str, list[str]]:
+        """Return public qualnames per file, rescanning only changed files.
+
+        If ``errors`` is given, files that cannot be read or parsed are left
+        out of the result and their errors appended to it; otherwise the
+        first error is raised.
+        """
+        results: dict[str, list[str]] = {}
+        stale: dict[str, _FileFingerprint] = {}
+        failures: list[AdapterError] = []
+
+        for path in paths:
+            try:
+                fingerprint = self._fingerprint(path)
+            except AdapterError as exc:
+                failures.append(exc)
+                continue
+            cached = self._scan_cache.get(path)
+            if cached is not None and cached[0] == fingerprint:
+                results[path] = cached[1]
+            else:
+                stale[path] = fingerprint
+
+        if len(stale) >= _PARALLEL_SCAN_THRESHOLD:
+            workers = min(len(stale), os.process_cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                scans = list(pool.map(_scan_file, stale, chunksize=8))
+        else:
+            scans = [_scan_file(path) for path in stale]
 
-        try:
-            return ast.parse(source, filename=path)
-        except SyntaxError as exc:
-            raise InvalidSourceError(
-                f"Invalid Python in {path}: {exc.msg} (line {exc.lineno})"
-            ) from exc
+        for (path, fingerprint), (names, error) in zip(stale.items(), scans, strict=True):
+            if error is not None:
+                failures.append(error)
+                continue
+            self._scan_cache[path] = (fingerprint, names)
+            results[path] = names
+
+        if failures:
+            if errors is None:
+                raise failures[0]
+            errors.extend(str(failure) for failure in failures)
+
+        return results
+
+    def _build_slice(
+        self,
+        source: str,
+        tree: ast.Module,
+        node: ast.FunctionDef | ast.AsyncFunctionDef,
+        target: _PythonTarget,
+        budget: int,
+    ) -> PythonContextSlice:
+        """Assemble a context slice for a resolved target node within a budget."""
+        target_source = self._node_source(source, node)
+        names = self._referenced_names(node, target.class_name)
+        definitions = self._module_definitions(tree)
+
+        referenced = [name for name in names if name in definitions and name != target.qualname]
+        if target.class_name is not None:
+            referenced.insert(0, target.class_name)
+
+        # Referenced methods are rendered inside their class stub.
+        methods: dict[str, list[str]] = {}
+        for name in referenced:
+            if "." in name:
+                class_name, method_name = name.split(".", 1)
+                methods.setdefault(class_name, []).append(method_name)
+        stub_names = [name for name in dict.fromkeys(referenced) if "." not in name]
+
+        used = len(target_source)
+        limit = budget * _CHARS_PER_TOKEN
+        truncated = False
+
+        def fits(text: str) -> bool:
+            nonlocal used, truncated
+            cost = len(text) + len(_SLICE_SEPARATOR)
+            if used + cost > limit:
+                truncated = True
+                return False
+            used += cost
+            return True
+
+        imports = [text for text in self._relevant_imports(tree, names) if fits(text)]
+        references = [
+            stub
+            for stub in (
+                self._stub(definitions[name], methods.get(name, [])) for name in stub_names
+            )
+            if fits(stub)
+        ]
+
+        diagnostics: list[str] = []
+        if len(target_source) > limit:
+            diagnostics.append(
+                f"Target source exceeds token budget ({self._estimate_tokens(target_source)} "
+                f"> {budget})"
+            )
+
+        return PythonContextSlice(
+            source=target_source,
+            imports=imports,
+            references=references,
+            token_estimate=self._estimate_tokens(
+                _SLICE_SEPARATOR.join([*imports, *references, target_source])
+            ),
+            truncated=truncated,
+            diagnostics=diagnostics,
+        )
+
+    def _node_source(self, source: str, node: DefNode) -> str:
+        """Return the dedented source of a definition, including decorators."""
+        start = min([node.lineno, *(d.lineno for d in node.decorator_list)])
+        end = node.end_lineno or node.lineno
+        lines = source.splitlines()[start - 1 : end]
+        return textwrap.dedent("\n".join(lines))
+
+    def _referenced_names(self, node: ast.AST, class_name: str | None) -> list[str]:
+        """Return the names a definition loads, in first-seen order.
+
+        Inside methods, ``self.attr`` and ``cls.attr`` are reported as
+        ``Class.attr`` so that sibling methods can be resolved.
+        """
+        names: dict[str, None] = {}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                names[child.id] = None
+            elif (
+                class_name is not None
+                and isinstance(child, ast.Attribute)
+                and isinstance(child.value, ast.Name)
+                and child.value.id in {"self", "cls"}
+            ):
+                names[f"{class_name}.{child.attr}"] = None
+        return list(names)
+
+    def _module_definitions(self, tree: ast.Module) -> dict[str, DefNode]:
+        """Index module-level functions, classes and class methods by qualname."""
+        definitions: dict[str, DefNode] = {}
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+                definitions[node.name] = node
+            elif isinstance(node, ast.ClassDef):
+                definitions[node.name] = node
+                for child in node.body:
+                    if isinstance(child, ast.FunctionDef | ast.AsyncFunctionDef):
+                        definitions[f"{node.name}.{child.name}"] = child
+        return definitions
+
+    def _relevant_imports(self, tree: ast.Module, names: list[str]) -> list[str]:
+        """Return module-level imports narrowed to the names actually used."""
+        wanted = {name.split(".")[0] for name in names}
+        imports: list[str] = []
+        for node in tree.body:
+            if not isinstance(node, ast.Import | ast.ImportFrom):
+                continue
+            aliases = [
+                alias
+                for alias in node.names
+                if (alias.asname or alias.name.split(".")[0]) in wanted
+            ]
+            if not aliases:
+                continue
+            narrowed = copy.copy(node)
+            narrowed.names = aliases
+            imports.append(ast.unparse(narrowed))
+        return imports
+
+    def _stub(self, node: DefNode, methods: list[str] | None = None) -> str:
+        """Render a definition as its signature and docstring only.
+
+        Class stubs keep their bases, the ``__init__`` stub, if any, and the
+        stubs of the requested ``methods``.
+        """
+        body: list[ast.stmt] = []
+        doc = ast.get_docstring(node, clean=False)
+        if doc:
+            body.append(ast.Expr(ast.Constant(doc)))
+
+        if isinstance(node, ast.ClassDef):
+            wanted = {"__init__", *(methods or [])}
+            for child in node.body:
+                if (
+                    isinstance(child, ast.FunctionDef | ast.AsyncFunctionDef)
+                    and child.name in wanted
+                ):
+                    body.append(ast.parse(self._stub(child)).body[0])
+
+        if not body or isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            body.append(ast.Expr(ast.Constant(...)))
+
+        stub = copy.copy(node)
+        stub.body = body
+        return ast.unparse(stub)
+
+    def _empty_slice(self, diagnostic: str) -> PythonContextSlice:
+        """Return an empty context slice carrying a single diagnostic."""
+        return PythonContextSlice(
+            source="",
+            imports=[],
+            references=[],
+            token_estimate=0,
+            truncated=False,
+            diagnostics=[diagnostic],
+        )
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Return a rough token count for a piece of text."""
+        return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
 
     def _find_node(
         self, tree: ast.Module, target: _PythonTarget
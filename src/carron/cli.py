@@ -1,8 +1,18 @@
 import argparse
+import hashlib
 import json
+import os
+import threading
 from pathlib import Path
+from typing import Any
 
-from carron.adapters.python.adapter import PythonRuntimeAdapter
+from carron.adapters.python.adapter import (
+    DEFAULT_CONTEXT_TOKEN_BUDGET,
+    PythonContextSlice,
+    PythonRuntimeAdapter,
+)
+from carron.core.batching import DEFAULT_MAX_BATCH_SIZE
+from carron.core.naming import generated_test_filename
 from carron.core.types import (
     FORGE_DIFF,
     FORGE_PROP,
@@ -16,7 +26,15 @@ from carron.forges.prop.forge import PropForge
 from carron.interfaces.adapter import AdapterError, TargetRef
 from carron.interfaces.forge import Forge
 from carron.planner.heuristic import HeuristicPlanner
+from carron.runner.collect import check_collectable
+from carron.runner.coverage import (
+    CoverageReportError,
+    format_report,
+    load_uncovered,
+    prepare_report,
+)
 from carron.runner.pytest_runner import run_pytest
+from carron.scheduler.budget import BudgetScheduler, ScheduledTarget, SchedulerLimits
 
 _COMMAND_SUGGEST = "suggest"
 _COMMAND_TEST = "test"
@@ -26,6 +44,28 @@ _MODE_EMIT, _MODE_CHECK, _MODE_RUN = _MODE_CHOICES
 _DEFAULT_MODE = _MODE_EMIT
 
 _DEFAULT_OUTPUT_DIR = "tests/generated"
+_STATE_DIR = ".carron"
+_COVERAGE_REPORT = "coverage.json"
+_CHECKPOINT = "checkpoint.json"
+_SCAN_CACHE = "scan-cache.json"
+_SCAN_CACHE_VERSION = 1
+
+# Coverage reports are merged by read-modify-write, so coverage runs are serialized.
+_COVERAGE_LOCK = threading.Lock()
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -33,20 +73,26 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="carron")
     sub = parser.add_subparsers(dest="command", required=True)
 
-    suggest = sub.add_parser(_COMMAND_SUGGEST)
-    suggest.add_argument("target")
-    suggest.add_argument("--apply", action="store_true")
-    suggest.add_argument("--mode", choices=_MODE_CHOICES, default=_DEFAULT_MODE)
-    suggest.add_argument("--output", default=_DEFAULT_OUTPUT_DIR)
-
-    def add_forge_command(name: str) -> None:
-        cmd = sub.add_parser(name)
+    def add_generation_options(cmd: argparse.ArgumentParser) -> None:
         cmd.add_argument("target")
         cmd.add_argument("--mode", choices=_MODE_CHOICES, default=_DEFAULT_MODE)
         cmd.add_argument("--output", default=_DEFAULT_OUTPUT_DIR)
+        cmd.add_argument("--context-budget", type=int, default=DEFAULT_CONTEXT_TOKEN_BUDGET)
+        cmd.add_argument("--max-batch-size", type=_positive_int, default=DEFAULT_MAX_BATCH_SIZE)
+        cmd.add_argument("--candidates", type=_positive_int, default=1)
+        cmd.add_argument("--coverage", action="store_true")
+        cmd.add_argument("--concurrency", type=_positive_int, default=1)
+        cmd.add_argument("--requests-per-minute", type=_positive_float, default=None)
+        cmd.add_argument("--token-budget", type=_positive_int, default=None)
+        cmd.add_argument("--time-budget", type=_positive_float, default=None, help="seconds")
+        cmd.add_argument("--resume", action="store_true")
+
+    suggest = sub.add_parser(_COMMAND_SUGGEST)
+    add_generation_options(suggest)
+    suggest.add_argument("--apply", action="store_true")
 
     for name in (_COMMAND_TEST, FORGE_PROP, FORGE_DIFF):
-        add_forge_command(name)
+        add_generation_options(sub.add_parser(name))
 
     return parser
 
@@ -80,32 +126,32 @@ def handle_suggest(args: argparse.Namespace) -> None:
         print("Planner returned invalid decision structure")
         raise SystemExit(1) from exc
 
-    forge = _select_forge(forge_name)
-    _execute_forge(forge, args.target, args.output, args.mode)
+    _schedule(args, [(forge_name, ctx) for ctx in _prepare_contexts(args)])
 
 
 def handle_test(args: argparse.Namespace) -> None:
     """Plan and generate tests for the given target.
 
-    Selects a forge via the planner and executes it according to the
-    requested mode.
+    Wildcard and directory targets are expanded first; each resulting
+    target is planned individually and handed to the scheduler, which
+    runs the selected forges according to the requested mode.
     """
+    ctxs = _prepare_contexts(args)
     planner = HeuristicPlanner()
-    plan = planner.plan(PlannerInput(target=args.target))
-    forge = _select_forge(plan[PLANNER_KEY_FORGE])
-    _execute_forge(forge, args.target, args.output, args.mode)
+    planned = [
+        (planner.plan(PlannerInput(target=ctx.target))[PLANNER_KEY_FORGE], ctx) for ctx in ctxs
+    ]
+    _schedule(args, planned)
 
 
 def handle_prop(args: argparse.Namespace) -> None:
     """Generate property-style tests directly using the prop forge."""
-    forge = PropForge()
-    _execute_forge(forge, args.target, args.output, args.mode)
+    _schedule(args, [(FORGE_PROP, ctx) for ctx in _prepare_contexts(args)])
 
 
 def handle_diff(args: argparse.Namespace) -> None:
     """Generate diff-style tests directly using the diff forge."""
-    forge = DiffForge()
-    _execute_forge(forge, args.target, args.output, args.mode)
+    _schedule(args, [(FORGE_DIFF, ctx) for ctx in _prepare_contexts(args)])
 
 
 def _select_forge(name: str) -> Forge:
@@ -116,34 +162,167 @@ def _select_forge(name: str) -> Forge:
     raise ValueError(f"Unknown forge: {name}")
 
 
-def _execute_forge(forge: Forge, target: str, output: str, mode: str) -> None:
-    """Generate tests via a forge after validating the target."""
-    adapter = PythonRuntimeAdapter()
-    ref = TargetRef(raw=target)
+def _prepare_contexts(args: argparse.Namespace) -> list[GenerationContext]:
+    """Expand and validate the requested target into generation contexts.
+
+    Every expanded target is validated before any context is returned, so
+    an invalid target aborts the run before artifacts are written.
+    """
+    if args.coverage and args.mode != _MODE_RUN:
+        print("--coverage requires --mode run")
+        raise SystemExit(1)
+
+    adapter = PythonRuntimeAdapter(context_token_budget=args.context_budget)
+    try:
+        uncovered = load_uncovered(_coverage_report_path(args))
+    except CoverageReportError as exc:
+        print(f"{exc}; ignoring it and starting a fresh report")
+        uncovered = {}
+    ctxs: list[GenerationContext] = []
+
+    scan_cache_path = Path(args.output) / _STATE_DIR / _SCAN_CACHE
+    scan_cache = _load_scan_cache(scan_cache_path)
+    adapter.import_scan_cache(scan_cache)
 
     try:
-        resolved = adapter.validate_target(ref)
-        info = adapter.get_target_summary(ref)
+        diagnostics: list[str] = []
+        refs = adapter.expand_target(TargetRef(raw=args.target), diagnostics)
+        for message in diagnostics:
+            print(f"Skipped: {message}")
+        for ref in refs:
+            ctxs.append(
+                GenerationContext(
+                    target=ref.raw,
+                    resolved_target=adapter.validate_target(ref),
+                    target_info=adapter.get_target_summary(ref),
+                    context_slice=adapter.get_context_slice(ref),
+                    max_batch_size=args.max_batch_size,
+                    candidates=args.candidates,
+                    candidate_validator=check_collectable if args.candidates > 1 else None,
+                    uncovered_lines=uncovered.get(ref.raw),
+                )
+            )
     except AdapterError as exc:
         print(exc)
         raise SystemExit(1) from exc
 
-    ctx = GenerationContext(
-        target=target,
-        target_info=info,
-        resolved_target=resolved,
+    if not ctxs:
+        print(f"No targets matched '{args.target}'")
+        raise SystemExit(1)
+
+    if adapter.export_scan_cache() != scan_cache:
+        _save_scan_cache(scan_cache_path, adapter.export_scan_cache())
+
+    return ctxs
+
+
+def _load_scan_cache(path: Path) -> dict[str, Any]:
+    """Load the persisted wildcard scan cache; an unreadable cache starts cold."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _SCAN_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_scan_cache(path: Path, files: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": _SCAN_CACHE_VERSION, "files": files}))
+    os.replace(tmp, path)
+
+
+def _schedule(args: argparse.Namespace, planned: list[tuple[str, GenerationContext]]) -> None:
+    """Run the planned forges through the budget scheduler and exit on failure."""
+    scheduler = BudgetScheduler(
+        SchedulerLimits(
+            max_concurrency=args.concurrency,
+            max_requests_per_minute=args.requests_per_minute,
+            max_tokens=args.token_budget,
+            time_budget=args.time_budget,
+        ),
+        Path(args.output) / _STATE_DIR / _CHECKPOINT,
+        resume=args.resume,
+    )
+    targets = [
+        ScheduledTarget(
+            ctx=ctx,
+            forge=forge_name,
+            mode=args.mode,
+            fingerprint=_fingerprint(ctx),
+            token_estimate=_token_estimate(ctx),
+        )
+        for forge_name, ctx in planned
+    ]
+
+    summary = scheduler.run(
+        targets, lambda forge_name, ctxs: _execute_forge(_select_forge(forge_name), ctxs, args)
     )
+    if summary.exit_code:
+        raise SystemExit(summary.exit_code)
+
+
+def _fingerprint(ctx: GenerationContext) -> str:
+    """Fingerprint a target by its source context, so edits mark it as changed."""
+    text = ctx.context_slice.render() if isinstance(ctx.context_slice, PythonContextSlice) else ""
+    return hashlib.sha256(f"{ctx.target}\n{text}".encode()).hexdigest()
 
-    result = forge.generate(ctx)
-    out_dir = Path(output)
-    paths = write_artifacts(result.artifacts, out_dir)
 
+def _token_estimate(ctx: GenerationContext) -> int:
+    if isinstance(ctx.context_slice, PythonContextSlice):
+        return ctx.context_slice.token_estimate
+    return 0
+
+
+def _execute_forge(forge: Forge, ctxs: list[GenerationContext], args: argparse.Namespace) -> None:
+    """Generate tests via a forge for validated contexts and handle the mode.
+
+    Artifacts of accepted targets are written (and checked or run) even if
+    other targets got none; the unit then fails with exit code 1.
+    """
+    result = forge.generate_batch(ctxs)
+    for message in result.diagnostics:
+        print(message)
+    paths = write_artifacts(result.artifacts, Path(args.output))
+    _run_artifacts(paths, ctxs, args)
+
+    generated = {artifact.relative_path for artifact in result.artifacts}
+    missing = [ctx.target for ctx in ctxs if generated_test_filename(ctx.target) not in generated]
+    if missing:
+        print(f"No tests generated for: {', '.join(missing)}")
+        raise SystemExit(1)
+
+
+def _run_artifacts(
+    paths: list[Path], ctxs: list[GenerationContext], args: argparse.Namespace
+) -> None:
+    """Check or run written artifacts according to the mode."""
+    mode = args.mode
     if mode == _MODE_EMIT:
         return
     collect_only = mode == _MODE_CHECK
     if mode in {_MODE_CHECK, _MODE_RUN}:
-        for p in paths:
-            run_pytest(p, collect_only=collect_only)
+        if not args.coverage:
+            for p in paths:
+                run_pytest(p, collect_only=collect_only)
+            return
+
+        report = _coverage_report_path(args)
+        with _COVERAGE_LOCK:
+            prepare_report(report, [ctx.target for ctx in ctxs])
+            try:
+                for p in paths:
+                    run_pytest(p, collect_only=collect_only, coverage_report=report)
+            finally:
+                for line in format_report(report, [ctx.target for ctx in ctxs]):
+                    print(line)
         return
 
     raise SystemExit(1)
+
+
+def _coverage_report_path(args: argparse.Namespace) -> Path:
+    return Path(args.output) / _STATE_DIR / _COVERAGE_REPORT
@@ -0,0 +1,84 @@
+"""Helpers for grouping several targets into a single LLM request."""
+
+import json
+from collections.abc import Mapping, Sequence
+
+DEFAULT_MAX_BATCH_SIZE = 8
+
+BATCH_RESPONSE_INSTRUCTION = (
+    "Return ONLY valid JSON matching the schema: an object mapping each target "
+    "string listed below to the complete pytest module generated for it. No markdown."
+)
+
+
+class BatchParseError(ValueError):
+    """Raised when a batched LLM response does not match the expected structure."""
+
+
+def target_module(target: str) -> str:
+    """Return the module or file locator of a target string."""
+    return target.split(":", 1)[0].strip()
+
+
+def group_targets_by_module(targets: Sequence[str], max_batch_size: int) -> list[list[str]]:
+    """Group targets sharing a module into batches of at most ``max_batch_size``.
+
+    Batches are returned in order of each module's first appearance, and
+    targets keep their relative order within a module.
+    """
+    if max_batch_size < 1:
+        raise ValueError("max_batch_size must be at least 1")
+
+    by_module: dict[str, list[str]] = {}
+    for target in targets:
+        by_module.setdefault(target_module(target), []).append(target)
+
+    batches: list[list[str]] = []
+    for members in by_module.values():
+        for start in range(0, len(members), max_batch_size):
+            batches.append(members[start : start + max_batch_size])
+    return batches
+
+
+def build_batch_prompt(shared_context: str, prompts: Mapping[str, str]) -> str:
+    """Build one prompt covering several targets, sending shared context once."""
+    sections = (
+        [shared_context, BATCH_RESPONSE_INSTRUCTION]
+        if shared_context
+        else [BATCH_RESPONSE_INSTRUCTION]
+    )
+    for target, prompt in prompts.items():
+        sections.append(f"### Target: {target}\n{prompt}")
+    return "\n\n".join(sections)
+
+
+def parse_batch_response(text: str, targets: Sequence[str]) -> dict[str, str]:
+    """Parse a batched response into generated source keyed by target.
+
+    Raises:
+        BatchParseError: If the response is not a JSON object with exactly one
+            non-empty string entry per requested target.
+    """
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise BatchParseError(f"Batch response is not valid JSON: {exc.msg}") from exc
+
+    if not isinstance(data, dict):
+        raise BatchParseError("Batch response must be a JSON object")
+
+    expected = set(targets)
+    if set(data) != expected:
+        missing = sorted(expected - set(data))
+        unexpected = sorted(set(data) - expected)
+        raise BatchParseError(
+            f"Batch response targets mismatch (missing={missing}, unexpected={unexpected})"
+        )
+
+    parsed: dict[str, str] = {}
+    for target in targets:
+        content = data[target]
+        if not isinstance(content, str) or not content.strip():
+            raise BatchParseError(f"Batch response for '{target}' must be a non-empty string")
+        parsed[target] = content
+    return parsed
@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+RATE_WINDOW_SECONDS = 60.0
+
+
+class RateLimitDeadlineError(RuntimeError):
+    """Raised when waiting for a request slot would run past the deadline."""
+
+
+class RateLimiter:
+    """Limit generation requests to a number per rolling minute.
+
+    One limiter is shared by every context of a run, so the limit holds
+    across concurrent units. ``acquire`` is called once per request, right
+    before it is sent; it reserves the next free slot and sleeps until then.
+    If that slot lies past ``deadline`` (a ``clock`` time), it raises
+    ``RateLimitDeadlineError`` without sleeping.
+    """
+
+    def __init__(
+        self,
+        max_per_minute: float,
+        *,
+        deadline: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._limit = max(1, int(max_per_minute))
+        self._window = RATE_WINDOW_SECONDS * self._limit / max_per_minute
+        self._deadline = deadline
+        self._clock = clock
+        self._sleep = sleep
+        self._slots: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent under the limit."""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            slot = now
+            if len(self._slots) >= self._limit:
+                slot = max(now, self._slots[-self._limit] + self._window)
+            if self._deadline is not None and slot > self._deadline:
+                raise RateLimitDeadlineError("time budget exhausted while waiting for rate limit")
+            self._slots.append(slot)
+
+        if slot > now:
+            self._sleep(slot - now)
+
+    def _expire(self, now: float) -> None:
+        while self._slots and now - self._slots[0] >= self._window:
+            self._slots.popleft()
@@ -1,9 +1,28 @@
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 
+from carron.core.batching import (
+    DEFAULT_MAX_BATCH_SIZE,
+    BatchParseError,
+    build_batch_prompt,
+    group_targets_by_module,
+    parse_batch_response,
+    target_module,
+)
+from carron.core.naming import generated_test_filename
+from carron.core.ratelimit import RateLimitDeadlineError, RateLimiter
+
 PLANNER_KEY_FORGE = "recommended_forge"
 FORGE_PROP = "prop"
 FORGE_DIFF = "diff"
 
+CandidateValidator = Callable[[str], list[str]]
+
+
+class CandidateRejectedError(RuntimeError):
+    """Raised when no generated candidate passes validation."""
+
 
 @dataclass
 class PlannerInput:
@@ -32,18 +51,151 @@ class GenerationContext:
     """Context passed to a forge describing the generation target.
 
     In v0.1, this context does not provide LLM access.
+
+    ``context_slice`` carries the adapter's minimal source context for the
+    target, intended to be embedded in prompts instead of whole modules.
+    ``max_batch_size`` bounds how many targets ``generate_batch`` sends in a
+    single request. ``candidates`` and ``candidate_validator`` configure
+    speculative generation in ``generate_validated_text``. ``uncovered_lines``
+    holds the target lines left uncovered by the previous ``--coverage`` run,
+    if any, so forges can focus new tests on them. ``rate_limiter``, if set,
+    is acquired before every request made through ``generate_text``.
     """
 
-    def __init__(self, target: str, *, target_info: object | None, resolved_target: object | None):
+    def __init__(
+        self,
+        target: str,
+        *,
+        target_info: object | None,
+        resolved_target: object | None,
+        context_slice: object | None = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        candidates: int = 1,
+        candidate_validator: CandidateValidator | None = None,
+        uncovered_lines: list[int] | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
         self.target = target
         self.target_info = target_info
         self.resolved_target = resolved_target
+        self.context_slice = context_slice
+        self.max_batch_size = max_batch_size
+        self.candidates = candidates
+        self.candidate_validator = candidate_validator
+        self.uncovered_lines = uncovered_lines
+        self.rate_limiter = rate_limiter
 
     def generate_text(self, prompt: str) -> str:
         """Generate text from a prompt.
 
+        Waits for the rate limiter, if any, before the request.
+
         Raises:
+            RateLimitDeadlineError: If the rate limit would delay the request
+                past the run's time budget.
             RuntimeError: Always, because LLM integration is not implemented in v0.1.
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
 
         raise RuntimeError("LLM integration not implemented in v0.1")
+
+    def generate_validated_text(self, prompt: str, *, target: str | None = None) -> str:
+        """Generate text that passes the candidate validator.
+
+        With ``candidates`` greater than one, that many generations are
+        requested concurrently and each is validated as it arrives. The first
+        candidate that passes is returned immediately; the remaining requests
+        are cancelled without being waited for and their results discarded.
+        Without a validator this is equivalent to ``generate_text``.
+        ``target`` names the target in errors and defaults to ``self.target``.
+
+        Raises:
+            CandidateRejectedError: If every candidate fails generation or
+                validation.
+            RateLimitDeadlineError: If the rate limit would delay a request
+                past the run's time budget.
+        """
+        validator = self.candidate_validator
+        if validator is None:
+            return self.generate_text(prompt)
+
+        count = max(1, self.candidates)
+        problems: list[str] = []
+        executor = ThreadPoolExecutor(max_workers=count)
+        try:
+            futures = [executor.submit(self.generate_text, prompt) for _ in range(count)]
+            for future in as_completed(futures):
+                try:
+                    text = future.result()
+                except RateLimitDeadlineError:
+                    raise
+                except Exception as exc:
+                    problems.append(f"Generation failed: {exc.__class__.__name__}: {exc}")
+                    continue
+                errors = validator(text)
+                if not errors:
+                    return text
+                problems.extend(errors)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise CandidateRejectedError(
+            f"No valid candidate for '{target or self.target}': " + "; ".join(problems)
+        )
+
+    def generate_batch(
+        self, shared_contexts: Mapping[str, str], prompts: Mapping[str, str]
+    ) -> GenerationResult:
+        """Generate one test module per target using multi-target requests.
+
+        Targets from the same module are grouped into requests of at most
+        ``max_batch_size`` targets. Each request sends its module's shared
+        context once and asks for a JSON object mapping targets to generated source. If a
+        response cannot be parsed, the targets of that request are retried
+        with single-target requests; so are individual entries rejected by the
+        candidate validator. Targets for which no valid candidate is produced
+        are reported in the diagnostics and get no artifact.
+
+        Args:
+            shared_contexts: Context common to the targets of a module (e.g. its
+                imports), keyed by module locator as returned by ``target_module``.
+            prompts: Per-target prompt text keyed by target string.
+
+        Returns:
+            A GenerationResult with one artifact per accepted target.
+        """
+        artifacts: list[GeneratedArtifact] = []
+        diagnostics: list[str] = []
+
+        for batch in group_targets_by_module(list(prompts), self.max_batch_size):
+            shared_context = shared_contexts.get(target_module(batch[0]), "")
+            if len(batch) > 1:
+                request = build_batch_prompt(shared_context, {t: prompts[t] for t in batch})
+                try:
+                    generated = parse_batch_response(self.generate_text(request), batch)
+                except BatchParseError as exc:
+                    diagnostics.append(f"Batch of {len(batch)} targets fell back to single: {exc}")
+                else:
+                    batch = [t for t in batch if not self._accepts(generated[t])]
+                    artifacts.extend(
+                        _artifact(t, text) for t, text in generated.items() if t not in batch
+                    )
+
+            for target in batch:
+                request = "\n\n".join(p for p in (shared_context, prompts[target]) if p)
+                try:
+                    text = self.generate_validated_text(request, target=target)
+                except CandidateRejectedError as exc:
+                    diagnostics.append(str(exc))
+                    continue
+                artifacts.append(_artifact(target, text))
+
+        return GenerationResult(artifacts=artifacts, diagnostics=diagnostics)
+
+    def _accepts(self, text: str) -> bool:
+        return self.candidate_validator is None or not self.candidate_validator(text)
+
+
+def _artifact(target: str, content: str) -> GeneratedArtifact:
+    return GeneratedArtifact(relative_path=generated_test_filename(target), content=content)
@@ -55,3 +55,15 @@ class Adapter(ABC):
         - The source code is syntactically invalid.
         - The referenced symbol cannot be resolved.
         """
+
+    def expand_target(
+        self, ref: TargetRef, diagnostics: list[str] | None = None
+    ) -> list[TargetRef]:
+        """Expand a pattern target into the concrete targets it denotes.
+
+        Adapters that support wildcard or package targets override this and
+        may append best-effort problems (e.g. skipped files) to
+        ``diagnostics``. The default treats every target as concrete and
+        returns it unchanged.
+        """
+        return [ref]
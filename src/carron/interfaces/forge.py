@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 from carron.core.types import GenerationContext, GenerationResult
 
@@ -26,3 +27,26 @@ class Forge(ABC):
             A GenerationResult containing artifacts and diagnostics.
         """
         ...
+
+    def generate_batch(self, ctxs: Sequence[GenerationContext]) -> GenerationResult:
+        """Produce test artifacts for several targets in one call.
+
+        The default implementation calls ``generate`` once per context and
+        merges the results. LLM-backed forges may override this to group
+        targets from the same module into shared requests via
+        ``GenerationContext.generate_batch``.
+
+        Args:
+            ctxs: Generation contexts, one per target.
+
+        Returns:
+            A GenerationResult containing the artifacts and diagnostics of
+            every target.
+        """
+        artifacts = []
+        diagnostics = []
+        for ctx in ctxs:
+            result = self.generate(ctx)
+            artifacts.extend(result.artifacts)
+            diagnostics.extend(result.diagnostics)
+        return GenerationResult(artifacts=artifacts, diagnostics=diagnostics)
@@ -0,0 +1,57 @@
+import ast
+import importlib.util
+
+
+def check_collectable(source: str, filename: str = "<generated>") -> list[str]:
+    """Check in-process whether generated test source would collect cleanly.
+
+    This is a fast approximation of ``pytest --collect-only`` that never
+    executes the generated code: the source must compile, its absolute
+    top-level imports must be resolvable, and it must define at least one
+    ``test_*`` function or ``Test*`` class.
+
+    Args:
+        source: Generated test module source.
+        filename: Name used in syntax error messages.
+
+    Returns:
+        A list of problems; empty if the source looks collectable.
+    """
+    try:
+        tree = ast.parse(source, filename=filename)
+        compile(tree, filename, "exec")
+    except SyntaxError as exc:
+        return [f"Invalid Python in {filename}: {exc.msg} (line {exc.lineno})"]
+
+    problems: list[str] = []
+    for module in _imported_modules(tree):
+        try:
+            found = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            found = False
+        if not found:
+            problems.append(f"Unresolvable import in {filename}: {module}")
+
+    if not any(_is_test_node(node) for node in tree.body):
+        problems.append(f"No tests found in {filename}")
+
+    return problems
+
+
+def _imported_modules(tree: ast.Module) -> list[str]:
+    modules: dict[str, None] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                modules[alias.name.split(".")[0]] = None
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules[node.module.split(".")[0]] = None
+    return list(modules)
+
+
+def _is_test_node(node: ast.stmt) -> bool:
+    if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+        return node.name.startswith("test")
+    if isinstance(node, ast.ClassDef):
+        return node.name.startswith("Test")
+    return False
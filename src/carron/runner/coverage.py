@@ -0,0 +1,322 @@
+import dis
+import importlib.util
+import json
+import os
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from types import CodeType
+from typing import Any
+
+COVERAGE_PLUGIN = "carron.runner.coverage"
+COVERAGE_REPORT_ENV = "CARRON_COVERAGE_REPORT"
+
+_REPORT_VERSION = 2
+_TOOL_NAME = "carron"
+_monitoring = sys.monitoring
+_events = _monitoring.events
+# Python 3.14 splits BRANCH into BRANCH_LEFT/BRANCH_RIGHT, one event per direction.
+_BRANCH_EVENTS: list[int] = [
+    getattr(_events, name) for name in ("BRANCH_LEFT", "BRANCH_RIGHT") if hasattr(_events, name)
+] or [_events.BRANCH]
+_SPLIT_BRANCH_EVENTS = len(_BRANCH_EVENTS) > 1
+_BRANCH_DIRECTIONS = 2
+
+
+class CoverageReportError(ValueError):
+    """Raised when a coverage report file cannot be read or has an unknown format."""
+
+
+def target_source_file(target: str) -> str | None:
+    """Return the resolved source file of a target, without importing it."""
+    locator = target.split(":", 1)[0].strip()
+    if locator.endswith(".py"):
+        return os.path.realpath(locator)
+
+    try:
+        spec = importlib.util.find_spec(locator)
+    except Exception:
+        return None
+
+    origin = spec.origin if spec is not None else None
+    if origin is None or not origin.endswith(".py"):
+        return None
+    return os.path.realpath(origin)
+
+
+def executable_lines(filename: str, qualname: str) -> list[int]:
+    """Return the lines of a target's code object (and nested code) that can execute.
+
+    The function prologue up to and including the first RESUME (which holds
+    e.g. RETURN_GENERATOR for generators and coroutines) is excluded since
+    it never reports a line event; so are later RESUMEs after yields.
+    """
+    lines: set[int] = set()
+    for code in _target_code(filename, qualname):
+        for instruction in _body_instructions(code):
+            lineno = instruction.positions.lineno if instruction.positions else None
+            if lineno is not None and instruction.opname != "RESUME":
+                lines.add(lineno)
+    return sorted(lines)
+
+
+def branch_points(filename: str, qualname: str) -> dict[str, int]:
+    """Return the conditional branches of a target's code, keyed by location, with their lines.
+
+    Each branch has two directions (taken and not taken, or loop body and
+    loop exit). Branches in exception handler code are excluded: they
+    include compiler-generated checks (``with`` exit, ``except`` type match)
+    that a normal run never takes both ways.
+    """
+    branches: dict[str, int] = {}
+    for code in _target_code(filename, qualname):
+        handlers = _handler_spans(code)
+        for instruction in _body_instructions(code):
+            lineno = instruction.positions.lineno if instruction.positions else None
+            if (
+                lineno is not None
+                and _is_branch(instruction.opname)
+                and not any(start <= instruction.offset < end for start, end in handlers)
+            ):
+                branches[_branch_key(code, instruction.offset)] = lineno
+    return branches
+
+
+def prepare_report(report: Path, targets: Iterable[str]) -> None:
+    """Reset the coverage entries of the given targets in a report file.
+
+    Entries of other targets are kept so later runs can still use them as
+    feedback. Targets without Python source are skipped. An unreadable
+    report is replaced by a fresh one.
+    """
+    try:
+        data = _load_report(report)
+    except CoverageReportError:
+        data = _empty_report()
+    for target in targets:
+        filename = target_source_file(target)
+        if filename is None:
+            continue
+        qualname = target.split(":", 1)[1].strip()
+        data["targets"][target] = {
+            "filename": filename,
+            "qualname": qualname,
+            "lines": executable_lines(filename, qualname),
+            "hit": [],
+            "branches": branch_points(filename, qualname),
+            "taken": {},
+        }
+    _write_report(report, data)
+
+
+def load_uncovered(report: Path) -> dict[str, list[int]]:
+    """Return the uncovered lines per target recorded in a report file.
+
+    Raises ``CoverageReportError`` if the report cannot be read.
+    """
+    entries = _load_report(report)["targets"]
+    return {
+        target: sorted(set(entry["lines"]) - set(entry["hit"])) for target, entry in entries.items()
+    }
+
+
+def format_report(report: Path, targets: Iterable[str]) -> list[str]:
+    """Return one human readable coverage line per target."""
+    entries = _load_report(report)["targets"]
+    lines: list[str] = []
+    for target in targets:
+        entry = entries.get(target)
+        if entry is None:
+            lines.append(f"{target}: coverage unavailable (no Python source)")
+            continue
+        total = len(entry["lines"])
+        uncovered = sorted(set(entry["lines"]) - set(entry["hit"]))
+        summary = f"{target}: {total - len(uncovered)}/{total} lines"
+        branches: dict[str, int] = entry["branches"]
+        if branches:
+            taken = {key: len(entry["taken"].get(key, ())) for key in branches}
+            covered = sum(min(count, _BRANCH_DIRECTIONS) for count in taken.values())
+            summary += f", {covered}/{_BRANCH_DIRECTIONS * len(branches)} branch directions"
+        if uncovered:
+            summary += f", uncovered: {', '.join(map(str, uncovered))}"
+        if branches:
+            partial = sorted(
+                {line for key, line in branches.items() if taken[key] < _BRANCH_DIRECTIONS}
+            )
+            if partial:
+                summary += f", partial branches: {', '.join(map(str, partial))}"
+        lines.append(summary)
+    return lines
+
+
+def _target_code(filename: str, qualname: str) -> Iterable[CodeType]:
+    module_code = compile(Path(filename).read_text(), filename, "exec")
+    for code in _walk_code(module_code):
+        if _in_scope(code.co_qualname, qualname):
+            yield code
+
+
+def _body_instructions(code: CodeType) -> Iterable[dis.Instruction]:
+    instructions = list(dis.get_instructions(code))
+    resume = next((i for i, ins in enumerate(instructions) if ins.opname == "RESUME"), -1)
+    return instructions[resume + 1 :]
+
+
+def _handler_spans(code: CodeType) -> list[tuple[int, int]]:
+    """Return the offset ranges of exception handler code in a code object."""
+    # ``exception_entries`` is not in typeshed's ``dis.Bytecode`` stubs.
+    entries: list[Any] = getattr(dis.Bytecode(code), "exception_entries", [])
+    targets = {entry.target for entry in entries}
+    return [(entry.start, entry.end) for entry in entries if entry.start in targets]
+
+
+def _walk_code(code: CodeType) -> Iterable[CodeType]:
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _walk_code(const)
+
+
+def _in_scope(code_qualname: str, qualname: str) -> bool:
+    return code_qualname == qualname or code_qualname.startswith(f"{qualname}.<locals>.")
+
+
+def _is_branch(opname: str) -> bool:
+    return opname.startswith("POP_JUMP_IF_") or opname == "FOR_ITER"
+
+
+def _branch_key(code: CodeType, offset: int) -> str:
+    return f"{code.co_qualname}:{code.co_firstlineno}:{offset}"
+
+
+def _empty_report() -> dict[str, Any]:
+    return {"version": _REPORT_VERSION, "targets": {}}
+
+
+def _load_report(report: Path) -> dict[str, Any]:
+    if not report.exists():
+        return _empty_report()
+    try:
+        data = json.loads(report.read_text())
+    except (OSError, ValueError) as exc:
+        raise CoverageReportError(f"Unreadable coverage report {report}: {exc}") from exc
+    if not isinstance(data, dict) or data.get("version") != _REPORT_VERSION:
+        raise CoverageReportError(f"Unsupported coverage report format in {report}")
+    if not isinstance(data.get("targets"), dict):
+        raise CoverageReportError(f"Unsupported coverage report format in {report}")
+    return data
+
+
+def _write_report(report: Path, data: dict[str, Any]) -> None:
+    report.parent.mkdir(parents=True, exist_ok=True)
+    report.write_text(json.dumps(data, indent=2))
+
+
+class _Collector:
+    """Collect first-hit line and branch events for target code objects.
+
+    Only ``PY_START`` is enabled globally. When a target's code object (or
+    code nested in it) starts, line and branch events are enabled for that
+    code object alone. Line callbacks return ``DISABLE``, so each line is
+    reported once and costs nothing afterwards. Python 3.13 has a single
+    ``BRANCH`` event per location for both directions, so a branch stays
+    enabled until both destinations have been seen; with the split
+    3.14 events each direction is disabled on its first hit.
+    """
+
+    def __init__(self, report: Path) -> None:
+        self._report = report
+        self._data = _load_report(report)
+        self._scopes: dict[str, list[tuple[str, str]]] = {}
+        for target, entry in self._data["targets"].items():
+            self._scopes.setdefault(entry["filename"], []).append((entry["qualname"], target))
+        self._filenames: dict[str, str] = {}
+        self._owners: dict[CodeType, str] = {}
+        self._hits: dict[str, set[int]] = {target: set() for target in self._data["targets"]}
+        self._taken: dict[str, dict[str, set[int]]] = {t: {} for t in self._data["targets"]}
+        self._tool_id: int | None = None
+
+    def start(self) -> None:
+        for tool_id in (_monitoring.COVERAGE_ID, 3, 4):
+            try:
+                _monitoring.use_tool_id(tool_id, _TOOL_NAME)
+            except ValueError:
+                continue
+            self._tool_id = tool_id
+            break
+        else:
+            return
+
+        _monitoring.register_callback(self._tool_id, _events.PY_START, self._on_start)
+        _monitoring.register_callback(self._tool_id, _events.LINE, self._on_line)
+        for event in _BRANCH_EVENTS:
+            _monitoring.register_callback(self._tool_id, event, self._on_branch)
+        _monitoring.set_events(self._tool_id, _events.PY_START)
+
+    def stop(self) -> None:
+        if self._tool_id is None:
+            return
+
+        _monitoring.set_events(self._tool_id, _events.NO_EVENTS)
+        for code in self._owners:
+            _monitoring.set_local_events(self._tool_id, code, _events.NO_EVENTS)
+        _monitoring.free_tool_id(self._tool_id)
+        self._tool_id = None
+
+        for target, entry in self._data["targets"].items():
+            entry["hit"] = sorted(set(entry["hit"]) | self._hits[target])
+            for key, destinations in self._taken[target].items():
+                entry["taken"][key] = sorted(set(entry["taken"].get(key, ())) | destinations)
+        _write_report(self._report, self._data)
+
+    def _on_start(self, code: CodeType, instruction_offset: int) -> object:
+        filename = self._filenames.get(code.co_filename)
+        if filename is None:
+            filename = self._filenames[code.co_filename] = os.path.realpath(code.co_filename)
+
+        for qualname, target in self._scopes.get(filename, ()):
+            if _in_scope(code.co_qualname, qualname) and self._tool_id is not None:
+                self._owners[code] = target
+                local_events = _events.LINE
+                for event in _BRANCH_EVENTS:
+                    local_events |= event
+                _monitoring.set_local_events(self._tool_id, code, local_events)
+                break
+        return _monitoring.DISABLE
+
+    def _on_line(self, code: CodeType, line_number: int) -> object:
+        target = self._owners.get(code)
+        if target is not None:
+            self._hits[target].add(line_number)
+        return _monitoring.DISABLE
+
+    def _on_branch(self, code: CodeType, instruction_offset: int, destination: int) -> object:
+        target = self._owners.get(code)
+        if target is None:
+            return _monitoring.DISABLE
+        taken = self._taken[target].setdefault(_branch_key(code, instruction_offset), set())
+        taken.add(destination)
+        if _SPLIT_BRANCH_EVENTS or len(taken) >= _BRANCH_DIRECTIONS:
+            return _monitoring.DISABLE
+        return None
+
+
+_collector: _Collector | None = None
+
+
+def pytest_configure(config: Any) -> None:
+    """Start collecting target coverage when a report path is configured."""
+    global _collector
+    report = os.environ.get(COVERAGE_REPORT_ENV)
+    if not report:
+        return
+    _collector = _Collector(Path(report))
+    _collector.start()
+
+
+def pytest_unconfigure(config: Any) -> None:
+    """Stop collecting and merge the hits into the report."""
+    global _collector
+    if _collector is not None:
+        _collector.stop()
+        _collector = None
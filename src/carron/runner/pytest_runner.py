@@ -1,22 +1,32 @@
+import os
 import subprocess
 from pathlib import Path
 
+from carron.runner.coverage import COVERAGE_PLUGIN, COVERAGE_REPORT_ENV
 
-def run_pytest(path: Path, collect_only: bool = False) -> None:
+
+def run_pytest(path: Path, collect_only: bool = False, coverage_report: Path | None = None) -> None:
     """Run pytest against a generated test file.
 
     Args:
         path: Path to the generated test file.
         collect_only: If True, run pytest in collection mode without executing tests.
+        coverage_report: If set, collect target coverage into this report file
+            (see ``carron.runner.coverage``).
     """
     cmd = ["pytest"]
+    env = None
 
     if collect_only:
         cmd.append("--collect-only")
 
+    if coverage_report is not None:
+        cmd.extend(["-p", COVERAGE_PLUGIN])
+        env = {**os.environ, COVERAGE_REPORT_ENV: str(coverage_report)}
+
     cmd.append(str(path))
 
-    result = subprocess.run(cmd, check=False)
+    result = subprocess.run(cmd, check=False, env=env)
 
     if result.returncode != 0:
         raise SystemExit(result.returncode)
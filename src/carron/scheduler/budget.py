@@ -0,0 +1,297 @@
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from carron.core.batching import group_targets_by_module
+from carron.core.ratelimit import RateLimitDeadlineError, RateLimiter
+from carron.core.types import GenerationContext
+
+_CHECKPOINT_VERSION = 1
+_STATUS_DONE = "done"
+_STATUS_FAILED = "failed"
+_CHECKPOINT_INTERVAL_SECONDS = 1.0
+
+# Priority weights: previous failures first, then changed targets, then uncovered code.
+_WEIGHT_FAILED = 4
+_WEIGHT_CHANGED = 2
+_WEIGHT_UNCOVERED = 1
+
+Work = Callable[[str, list[GenerationContext]], None]
+
+
+@dataclass
+class SchedulerLimits:
+    """Resource limits for a scheduled run; ``None`` means unlimited."""
+
+    max_concurrency: int = 1
+    max_requests_per_minute: float | None = None
+    max_tokens: int | None = None
+    time_budget: float | None = None
+
+
+@dataclass
+class ScheduledTarget:
+    """A validated target queued for generation with its scheduling metadata."""
+
+    ctx: GenerationContext
+    forge: str
+    mode: str
+    fingerprint: str
+    token_estimate: int
+
+
+@dataclass
+class SchedulerSummary:
+    """Outcome of a scheduled run."""
+
+    completed: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    pending: list[str] = field(default_factory=list)
+    tokens: int = 0
+    elapsed: float = 0.0
+    exit_code: int = 0
+
+
+@dataclass
+class _Unit:
+    forge: str
+    targets: list[ScheduledTarget]
+
+    @property
+    def names(self) -> list[str]:
+        return [t.ctx.target for t in self.targets]
+
+    @property
+    def tokens(self) -> int:
+        return sum(t.token_estimate for t in self.targets)
+
+
+class BudgetScheduler:
+    """Run forge work for many targets within concurrency, rate, token and time limits.
+
+    Targets are prioritized (previous failures, then targets changed since
+    the last run, then targets with uncovered lines) and grouped into units
+    of one forge and one module, at most ``max_batch_size`` targets each.
+    Progress is checkpointed to a JSON file as units finish (at most once a
+    second, and always when the run ends or is interrupted) so that a run
+    started with ``resume=True`` skips targets already completed with an
+    unchanged fingerprint, forge and mode. An unreadable checkpoint is
+    reported and ignored.
+
+    The scheduler never generates or runs tests itself; the ``work``
+    callable passed to ``run`` does. The request rate limit is enforced
+    where requests are made: every scheduled context shares one
+    ``RateLimiter`` whose deadline is the end of the time budget.
+    """
+
+    def __init__(
+        self,
+        limits: SchedulerLimits,
+        checkpoint: Path,
+        *,
+        resume: bool = False,
+        report: Callable[[str], None] = print,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._limits = limits
+        self._checkpoint = checkpoint
+        self._resume = resume
+        self._report = report
+        self._clock = clock
+        self._sleep = sleep
+        self._state = self._load_checkpoint()
+        self._last_checkpoint = float("-inf")
+
+    def prioritize(self, targets: Sequence[ScheduledTarget]) -> list[ScheduledTarget]:
+        """Return targets ordered by descending priority, stable within a priority."""
+        return sorted(targets, key=self._priority, reverse=True)
+
+    def run(self, targets: Sequence[ScheduledTarget], work: Work) -> SchedulerSummary:
+        """Schedule ``work`` over the targets and return a summary of the run.
+
+        ``work`` receives a forge name and the contexts of one unit. A unit
+        fails if ``work`` raises; a ``SystemExit`` code is kept as the run's
+        exit code. Units not started before a limit is exhausted, and units
+        stopped by ``RateLimitDeadlineError``, are left pending for a later
+        resumed run.
+        """
+        summary = SchedulerSummary()
+        queued: list[ScheduledTarget] = []
+        for target in targets:
+            if self._resume and self._is_complete(target):
+                summary.skipped.append(target.ctx.target)
+            else:
+                queued.append(target)
+
+        if summary.skipped:
+            self._report(f"Skipping {len(summary.skipped)} targets completed in a previous run")
+
+        units = deque(self._units(self.prioritize(queued)))
+        total = sum(len(unit.targets) for unit in units)
+        start = self._clock()
+        self._share_rate_limiter(queued, start)
+        stop_reason: str | None = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self._limits.max_concurrency)) as pool:
+                running: dict[Future[None], _Unit] = {}
+
+                while units or running:
+                    while units and len(running) < max(1, self._limits.max_concurrency):
+                        stop_reason = stop_reason or self._exhausted(units[0], summary, start)
+                        if stop_reason is not None:
+                            break
+                        unit = units.popleft()
+                        summary.tokens += unit.tokens
+                        running[pool.submit(work, unit.forge, [t.ctx for t in unit.targets])] = unit
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        unit = running.pop(future)
+                        if isinstance(future.exception(), RateLimitDeadlineError):
+                            stop_reason = "time budget exhausted"
+                            summary.tokens -= unit.tokens
+                            units.appendleft(unit)
+                            continue
+                        self._finish(unit, future, summary)
+                        finished = len(summary.completed) + len(summary.failed)
+                        self._report_progress(finished, total, summary, start)
+        finally:
+            self._write_checkpoint(force=True)
+
+        summary.pending = [name for unit in units for name in unit.names]
+        summary.elapsed = self._clock() - start
+        if stop_reason is not None and summary.pending:
+            self._report(
+                f"Stopped: {stop_reason}; {len(summary.pending)} targets pending "
+                "(rerun with --resume to continue)"
+            )
+        return summary
+
+    def _priority(self, target: ScheduledTarget) -> int:
+        entry = self._state.get(target.ctx.target, {})
+        score = 0
+        if entry.get("status") == _STATUS_FAILED:
+            score += _WEIGHT_FAILED
+        if entry.get("fingerprint") != target.fingerprint:
+            score += _WEIGHT_CHANGED
+        if target.ctx.uncovered_lines:
+            score += _WEIGHT_UNCOVERED
+        return score
+
+    def _is_complete(self, target: ScheduledTarget) -> bool:
+        entry = self._state.get(target.ctx.target, {})
+        return bool(
+            entry.get("status") == _STATUS_DONE
+            and entry.get("fingerprint") == target.fingerprint
+            and entry.get("forge") == target.forge
+            and entry.get("mode") == target.mode
+        )
+
+    def _units(self, targets: list[ScheduledTarget]) -> list[_Unit]:
+        by_name = {t.ctx.target: t for t in targets}
+        by_forge: dict[str, list[str]] = {}
+        batch_size: dict[str, int] = {}
+        for target in targets:
+            by_forge.setdefault(target.forge, []).append(target.ctx.target)
+            batch_size.setdefault(target.forge, target.ctx.max_batch_size)
+
+        units: list[_Unit] = []
+        for forge, names in by_forge.items():
+            for batch in group_targets_by_module(names, batch_size[forge]):
+                units.append(_Unit(forge=forge, targets=[by_name[name] for name in batch]))
+        units.sort(key=lambda unit: max(self._priority(t) for t in unit.targets), reverse=True)
+        return units
+
+    def _exhausted(self, unit: _Unit, summary: SchedulerSummary, start: float) -> str | None:
+        limits = self._limits
+        if limits.time_budget is not None and self._clock() - start >= limits.time_budget:
+            return "time budget exhausted"
+        if limits.max_tokens is not None and summary.tokens + unit.tokens > limits.max_tokens:
+            return "token budget exhausted"
+        return None
+
+    def _share_rate_limiter(self, targets: Sequence[ScheduledTarget], start: float) -> None:
+        limit = self._limits.max_requests_per_minute
+        if limit is None:
+            return
+
+        budget = self._limits.time_budget
+        limiter = RateLimiter(
+            limit,
+            deadline=None if budget is None else start + budget,
+            clock=self._clock,
+            sleep=self._sleep,
+        )
+        for target in targets:
+            target.ctx.rate_limiter = limiter
+
+    def _finish(self, unit: _Unit, future: Future[None], summary: SchedulerSummary) -> None:
+        status = _STATUS_DONE
+        try:
+            future.result()
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+            if code:
+                status = _STATUS_FAILED
+                summary.exit_code = summary.exit_code or code
+        except Exception as exc:
+            status = _STATUS_FAILED
+            summary.exit_code = summary.exit_code or 1
+            self._report(f"{', '.join(unit.names)}: {exc.__class__.__name__}: {exc}")
+
+        (summary.completed if status == _STATUS_DONE else summary.failed).extend(unit.names)
+        for target in unit.targets:
+            self._state[target.ctx.target] = {
+                "status": status,
+                "fingerprint": target.fingerprint,
+                "forge": target.forge,
+                "mode": target.mode,
+            }
+        self._write_checkpoint()
+
+    def _report_progress(
+        self, finished: int, total: int, summary: SchedulerSummary, start: float
+    ) -> None:
+        elapsed = max(self._clock() - start, 1e-9)
+        rate = finished / elapsed * 60
+        self._report(
+            f"[{finished}/{total}] {len(summary.failed)} failed, "
+            f"{rate:.1f} targets/min, ~{summary.tokens} prompt tokens"
+        )
+
+    def _load_checkpoint(self) -> dict[str, dict[str, Any]]:
+        if not self._checkpoint.exists():
+            return {}
+        try:
+            data = json.loads(self._checkpoint.read_text())
+        except (OSError, ValueError) as exc:
+            self._report(f"Ignoring unreadable checkpoint {self._checkpoint}: {exc}")
+            return {}
+        targets = data.get("targets") if isinstance(data, dict) else None
+        if not isinstance(targets, dict):
+            self._report(f"Ignoring checkpoint with unknown format: {self._checkpoint}")
+            return {}
+        return targets
+
+    def _write_checkpoint(self, *, force: bool = False) -> None:
+        now = self._clock()
+        if not force and now - self._last_checkpoint < _CHECKPOINT_INTERVAL_SECONDS:
+            return
+        self._last_checkpoint = now
+        self._checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._checkpoint.with_suffix(".tmp")
+        data = {"version": _CHECKPOINT_VERSION, "targets": self._state}
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, self._checkpoint)
@@ -0,0 +1,180 @@
+"""Tests for Python adapter context slicing."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from carron.adapters.python.adapter import PythonRuntimeAdapter
+from carron.interfaces.adapter import InvalidSourceError, TargetRef
+
+_SOURCE = '''import os
+import json as j
+
+
+def helper(x: int) -> int:
+    """Double a number."""
+    return x * 2
+
+
+def unused() -> None:
+    return None
+
+
+class Box:
+    """A box."""
+
+    def __init__(self, v: int) -> None:
+        self.v = v
+
+    def get(self) -> int:
+        return self._norm(self.v)
+
+    def _norm(self, v: int) -> int:
+        return helper(v)
+
+
+def target(n: int) -> str:
+    return j.dumps(helper(n)) + os.sep
+'''
+
+
+def _write_module(tmp_path: Path) -> Path:
+    path = tmp_path / "mod.py"
+    path.write_text(_SOURCE)
+    return path
+
+
+def test_context_slice_includes_referenced_stubs_and_imports(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+
+    ctx = adapter.get_context_slice(TargetRef(raw=f"{path}:target"))
+
+    assert ctx.source.startswith("def target(n: int) -> str:")
+    assert ctx.imports == ["import os", "import json as j"]
+    assert len(ctx.references) == 1
+    assert ctx.references[0].startswith("def helper(x: int) -> int:")
+    assert "return x * 2" not in ctx.references[0]
+    assert "unused" not in ctx.render()
+    assert not ctx.truncated
+
+
+def test_context_slice_nests_sibling_methods_in_class_stub(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+
+    ctx = adapter.get_context_slice(TargetRef(raw=f"{path}:Box.get"))
+
+    assert ctx.source.startswith("def get(self) -> int:")
+    assert len(ctx.references) == 1
+    assert ctx.references[0].startswith("class Box:")
+    assert "def _norm(self, v: int) -> int:" in ctx.references[0]
+
+
+def test_context_slice_respects_token_budget(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+
+    ctx = adapter.get_context_slice(TargetRef(raw=f"{path}:target"), token_budget=20)
+
+    assert ctx.truncated
+    assert ctx.references == []
+    assert ctx.source.startswith("def target")
+
+
+def test_context_slice_is_cached_until_file_changes(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+    ref = TargetRef(raw=f"{path}:target")
+
+    first = adapter.get_context_slice(ref)
+    assert adapter.get_context_slice(ref) is first
+
+    path.write_text(_SOURCE.replace("x * 2", "x * 3  # changed"))
+    assert adapter.get_context_slice(ref) is not first
+
+
+def test_context_slice_without_source_reports_diagnostic() -> None:
+    adapter = PythonRuntimeAdapter()
+
+    ctx = adapter.get_context_slice(TargetRef(raw="math:sqrt"))
+
+    assert ctx.render() == ""
+    assert ctx.diagnostics
+
+
+def test_expand_module_wildcard_lists_public_functions_and_methods(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+
+    refs = adapter.expand_target(TargetRef(raw=f"{path}:*"))
+
+    assert [r.raw.split(":", 1)[1] for r in refs] == ["helper", "unused", "Box.get", "target"]
+
+
+def test_expand_class_wildcard_lists_public_methods(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    adapter = PythonRuntimeAdapter()
+
+    refs = adapter.expand_target(TargetRef(raw=f"{path}:Box.*"))
+
+    assert refs == [TargetRef(raw=f"{path}:Box.get")]
+
+
+def test_expand_directory_scans_python_files(tmp_path: Path) -> None:
+    _write_module(tmp_path)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "other.py").write_text("def other():\n    return 1\n")
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "stale.py").write_text("def stale():\n    return 1\n")
+    adapter = PythonRuntimeAdapter()
+
+    refs = adapter.expand_target(TargetRef(raw=f"{tmp_path}/"))
+
+    assert TargetRef(raw=f"{tmp_path / 'sub' / 'other.py'}:other") in refs
+    assert len(refs) == 5
+
+
+def test_expand_target_leaves_concrete_targets_untouched() -> None:
+    adapter = PythonRuntimeAdapter()
+    ref = TargetRef(raw="math:sqrt")
+
+    assert adapter.expand_target(ref) == [ref]
+
+
+def test_expand_directory_skips_unreadable_files_with_diagnostics(tmp_path: Path) -> None:
+    _write_module(tmp_path)
+    (tmp_path / "latin.py").write_bytes(b'x = "\xff"\n')
+    (tmp_path / "py2.py").write_text('print "hello"\n')
+    adapter = PythonRuntimeAdapter()
+    diagnostics: list[str] = []
+
+    refs = adapter.expand_target(TargetRef(raw=f"{tmp_path}/"), diagnostics)
+
+    assert len(refs) == 4
+    assert len(diagnostics) == 2
+
+
+def test_expand_explicit_file_with_bad_encoding_raises_adapter_error(tmp_path: Path) -> None:
+    path = tmp_path / "latin.py"
+    path.write_bytes(b'x = "\xff"\n')
+    adapter = PythonRuntimeAdapter()
+
+    with pytest.raises(InvalidSourceError):
+        adapter.expand_target(TargetRef(raw=f"{path}:*"))
+
+
+def test_scan_cache_round_trips_between_adapters(tmp_path: Path) -> None:
+    path = _write_module(tmp_path)
+    first = PythonRuntimeAdapter()
+    refs = first.expand_target(TargetRef(raw=f"{tmp_path}/"))
+
+    second = PythonRuntimeAdapter()
+    second.import_scan_cache(json.loads(json.dumps(first.export_scan_cache())))
+
+    assert second.export_scan_cache() == first.export_scan_cache()
+    assert second.expand_target(TargetRef(raw=f"{tmp_path}/")) == refs
+
+    path.write_text(_SOURCE + "\n\ndef added() -> None:\n    return None\n")
+    assert TargetRef(raw=f"{path}:added") in second.expand_target(TargetRef(raw=f"{tmp_path}/"))
@@ -0,0 +1,102 @@
+"""Tests for multi-target prompt batching."""
+
+import json
+from collections.abc import Callable
+
+import pytest
+
+from carron.core.batching import (
+    BatchParseError,
+    group_targets_by_module,
+    parse_batch_response,
+)
+from carron.core.naming import generated_test_filename
+from carron.core.types import GenerationContext
+from carron.runner.collect import check_collectable
+
+
+class _ScriptedContext(GenerationContext):
+    """Context whose LLM replies are produced by a callable."""
+
+    def __init__(self, reply: Callable[[str], str], *, max_batch_size: int) -> None:
+        super().__init__(
+            "mod:a", target_info=None, resolved_target=None, max_batch_size=max_batch_size
+        )
+        self.reply = reply
+        self.prompts: list[str] = []
+
+    def generate_text(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.reply(prompt)
+
+
+def test_group_targets_by_module_respects_max_batch_size() -> None:
+    targets = ["a:f", "b:g", "a:h", "a:i"]
+
+    assert group_targets_by_module(targets, 2) == [["a:f", "a:h"], ["a:i"], ["b:g"]]
+
+
+def test_parse_batch_response_rejects_missing_targets() -> None:
+    with pytest.raises(BatchParseError):
+        parse_batch_response(json.dumps({"a:f": "x"}), ["a:f", "a:g"])
+
+
+def test_generate_batch_sends_one_request_per_module_batch() -> None:
+    def reply(prompt: str) -> str:
+        return json.dumps({"mod:a": "def test_a(): pass\n", "mod:b": "def test_b(): pass\n"})
+
+    ctx = _ScriptedContext(reply, max_batch_size=4)
+
+    result = ctx.generate_batch({"mod": "import mod"}, {"mod:a": "test a", "mod:b": "test b"})
+
+    assert len(ctx.prompts) == 1
+    assert ctx.prompts[0].count("import mod") == 1
+    assert [a.relative_path for a in result.artifacts] == [
+        generated_test_filename("mod:a"),
+        generated_test_filename("mod:b"),
+    ]
+    assert result.diagnostics == []
+
+
+def test_generate_batch_falls_back_to_single_requests_on_bad_json() -> None:
+    def reply(prompt: str) -> str:
+        return "not json" if "### Target" in prompt else "def test_one(): pass\n"
+
+    ctx = _ScriptedContext(reply, max_batch_size=4)
+
+    result = ctx.generate_batch({}, {"mod:a": "test a", "mod:b": "test b"})
+
+    assert len(ctx.prompts) == 3
+    assert [a.content for a in result.artifacts] == ["def test_one(): pass\n"] * 2
+    assert len(result.diagnostics) == 1
+
+
+def test_generate_batch_sends_each_module_only_its_shared_context() -> None:
+    def reply(prompt: str) -> str:
+        return "def test_one(): pass\n"
+
+    ctx = _ScriptedContext(reply, max_batch_size=4)
+
+    ctx.generate_batch({"a": "CONTEXT A", "b": "CONTEXT B"}, {"a:f": "test f", "b:g": "test g"})
+
+    assert len(ctx.prompts) == 2
+    assert "CONTEXT A" in ctx.prompts[0] and "CONTEXT B" not in ctx.prompts[0]
+    assert "CONTEXT B" in ctx.prompts[1] and "CONTEXT A" not in ctx.prompts[1]
+
+
+def test_generate_batch_keeps_accepted_artifacts_when_one_target_is_rejected() -> None:
+    good = "def test_ok():\n    pass\n"
+
+    def reply(prompt: str) -> str:
+        if "### Target" in prompt:
+            return json.dumps({"mod:a": good, "mod:b": "x = 1\n"})
+        return "still not a test\n"
+
+    ctx = _ScriptedContext(reply, max_batch_size=4)
+    ctx.candidate_validator = check_collectable
+
+    result = ctx.generate_batch({}, {"mod:a": "test a", "mod:b": "test b"})
+
+    assert [a.relative_path for a in result.artifacts] == [generated_test_filename("mod:a")]
+    assert len(result.diagnostics) == 1
+    assert "mod:b" in result.diagnostics[0]
@@ -5,6 +5,8 @@ from pathlib import Path
 import pytest
 
 from carron.cli import build_parser, dispatch
+from carron.core.types import GenerationContext, GenerationResult
+from carron.forges.prop.forge import PropForge
 
 
 def test_invalid_python_target_writes_no_artifacts(tmp_path: Path) -> None:
@@ -70,3 +72,78 @@ def test_suggest_apply_default_emit_generates(tmp_path: Path) -> None:
 
     assert out_dir.exists()
     assert any(p.is_file() and p.suffix == ".py" for p in out_dir.rglob("*"))
+
+
+def test_wildcard_target_generates_artifact_per_function(tmp_path: Path) -> None:
+    good = tmp_path / "good.py"
+    good.write_text("def ok():\n    return 1\n\n\ndef fine():\n    return 2\n")
+
+    out_dir = tmp_path / "out"
+
+    parser = build_parser()
+    args = parser.parse_args(["test", f"{good}:*", "--output", str(out_dir)])
+
+    dispatch(args)
+
+    assert len([p for p in out_dir.rglob("*.py") if p.is_file()]) == 2
+
+
+def test_coverage_requires_run_mode(tmp_path: Path) -> None:
+    good = tmp_path / "good.py"
+    good.write_text("def ok():\n    return 1\n")
+
+    out_dir = tmp_path / "out"
+
+    parser = build_parser()
+    args = parser.parse_args(["prop", f"{good}:ok", "--coverage", "--output", str(out_dir)])
+
+    with pytest.raises(SystemExit) as exc:
+        dispatch(args)
+
+    assert exc.value.code != 0
+    assert not out_dir.exists()
+
+
+@pytest.mark.parametrize(
+    ("option", "value"),
+    [
+        ("--max-batch-size", "0"),
+        ("--candidates", "0"),
+        ("--concurrency", "0"),
+        ("--token-budget", "0"),
+        ("--requests-per-minute", "0"),
+        ("--requests-per-minute", "-5"),
+        ("--time-budget", "0"),
+        ("--time-budget", "nan"),
+    ],
+)
+def test_limit_options_must_be_positive(option: str, value: str) -> None:
+    parser = build_parser()
+
+    with pytest.raises(SystemExit) as exc:
+        parser.parse_args(["prop", "mod:f", option, value])
+
+    assert exc.value.code == 2
+
+
+def test_target_without_artifact_fails_the_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """A target rejected by the forge must be reported and fail the run."""
+    good = tmp_path / "good.py"
+    good.write_text("def ok():\n    return 1\n")
+    out_dir = tmp_path / "out"
+
+    def reject(self: PropForge, ctx: GenerationContext) -> GenerationResult:
+        return GenerationResult(
+            artifacts=[], diagnostics=[f"No valid candidate for '{ctx.target}'"]
+        )
+
+    monkeypatch.setattr(PropForge, "generate", reject)
+    args = build_parser().parse_args(["prop", f"{good}:ok", "--output", str(out_dir)])
+
+    with pytest.raises(SystemExit) as exc:
+        dispatch(args)
+
+    assert exc.value.code == 1
+    assert "No valid candidate" in capsys.readouterr().out
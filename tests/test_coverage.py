@@ -0,0 +1,148 @@
+"""Tests for sys.monitoring-based target coverage."""
+
+from pathlib import Path
+
+import pytest
+
+from carron.runner.coverage import (
+    CoverageReportError,
+    branch_points,
+    executable_lines,
+    format_report,
+    load_uncovered,
+    prepare_report,
+)
+from carron.runner.pytest_runner import run_pytest
+
+_TARGET = """def f(x):
+    if x > 0:
+        y = 1
+    else:
+        y = 2
+    return y
+
+
+def untouched():
+    return 0
+"""
+
+
+def test_executable_lines_skip_function_entry(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_TARGET)
+
+    assert executable_lines(str(path), "f") == [2, 3, 5, 6]
+
+
+def test_coverage_reports_uncovered_lines_per_target(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_TARGET)
+    test_file = tmp_path / "test_tgt.py"
+    test_file.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {str(tmp_path)!r})\n"
+        "import tgt\n\n\n"
+        "def test_f():\n"
+        "    assert tgt.f(1) == 1\n"
+    )
+    report = tmp_path / "out" / ".carron" / "coverage.json"
+    targets = [f"{path}:f", f"{path}:untouched"]
+
+    prepare_report(report, targets)
+    run_pytest(test_file, coverage_report=report)
+
+    assert load_uncovered(report) == {f"{path}:f": [5], f"{path}:untouched": [10]}
+    assert format_report(report, targets)[0] == (
+        f"{path}:f: 3/4 lines, 1/2 branch directions, uncovered: 5, partial branches: 2"
+    )
+
+
+def test_coverage_tracks_both_branch_directions(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_TARGET)
+    test_file = tmp_path / "test_tgt.py"
+    test_file.write_text(
+        "import sys\n"
+        f"sys.path.insert(0, {str(tmp_path)!r})\n"
+        "import tgt\n\n\n"
+        "def test_f():\n"
+        "    assert tgt.f(1) == 1\n"
+        "    assert tgt.f(0) == 2\n"
+    )
+    report = tmp_path / "out" / ".carron" / "coverage.json"
+    targets = [f"{path}:f"]
+
+    prepare_report(report, targets)
+    run_pytest(test_file, coverage_report=report)
+
+    assert format_report(report, targets) == [f"{path}:f: 4/4 lines, 2/2 branch directions"]
+
+
+def test_corrupt_report_raises_and_is_replaced(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_TARGET)
+    report = tmp_path / "coverage.json"
+    report.write_text("{not json")
+
+    with pytest.raises(CoverageReportError):
+        load_uncovered(report)
+
+    prepare_report(report, [f"{path}:f"])
+    assert load_uncovered(report) == {f"{path}:f": [2, 3, 5, 6]}
+
+
+_PROLOGUE_TARGETS = """def gen(n):
+    for i in range(n):
+        yield i
+
+
+async def coro():
+    return 1
+
+
+def read(path):
+    with open(path) as fh:
+        return fh.read()
+"""
+
+
+def test_executable_lines_skip_generator_and_coroutine_prologue(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_PROLOGUE_TARGETS)
+
+    assert executable_lines(str(path), "gen") == [2, 3]
+    assert executable_lines(str(path), "coro") == [7]
+
+
+def test_branch_points_skip_exception_handler_code(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_PROLOGUE_TARGETS)
+
+    assert branch_points(str(path), "read") == {}
+
+
+def test_coverage_of_generator_coroutine_and_with_targets(tmp_path: Path) -> None:
+    path = tmp_path / "tgt.py"
+    path.write_text(_PROLOGUE_TARGETS)
+    test_file = tmp_path / "test_tgt.py"
+    test_file.write_text(
+        "import asyncio\n"
+        "import sys\n"
+        f"sys.path.insert(0, {str(tmp_path)!r})\n"
+        "import tgt\n\n\n"
+        "def test_targets():\n"
+        "    assert list(tgt.gen(2)) == [0, 1]\n"
+        "    assert asyncio.run(tgt.coro()) == 1\n"
+        "    assert tgt.read(__file__)\n"
+    )
+    report = tmp_path / "out" / ".carron" / "coverage.json"
+    targets = [f"{path}:gen", f"{path}:coro", f"{path}:read"]
+
+    prepare_report(report, targets)
+    run_pytest(test_file, coverage_report=report)
+
+    assert format_report(report, targets) == [
+        f"{path}:gen: 2/2 lines, 2/2 branch directions",
+        f"{path}:coro: 1/1 lines",
+        f"{path}:read: 2/2 lines",
+    ]
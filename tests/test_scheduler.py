@@ -0,0 +1,207 @@
+"""Tests for the budget-aware scheduler."""
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from carron.core.ratelimit import RateLimitDeadlineError
+from carron.core.types import GenerationContext
+from carron.scheduler.budget import BudgetScheduler, ScheduledTarget, SchedulerLimits
+
+
+def _target(
+    name: str,
+    *,
+    fingerprint: str = "v1",
+    tokens: int = 10,
+    forge: str = "prop",
+    mode: str = "emit",
+    batch_size: int = 1,
+    candidates: int = 1,
+) -> ScheduledTarget:
+    ctx = GenerationContext(
+        name,
+        target_info=None,
+        resolved_target=None,
+        max_batch_size=batch_size,
+        candidates=candidates,
+    )
+    return ScheduledTarget(
+        ctx=ctx, forge=forge, mode=mode, fingerprint=fingerprint, token_estimate=tokens
+    )
+
+
+def _scheduler(
+    tmp_path: Path,
+    limits: SchedulerLimits,
+    *,
+    resume: bool = False,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> BudgetScheduler:
+    return BudgetScheduler(
+        limits,
+        tmp_path / "checkpoint.json",
+        resume=resume,
+        report=lambda _: None,
+        clock=clock,
+        sleep=sleep,
+    )
+
+
+def test_resume_skips_completed_unchanged_targets(tmp_path: Path) -> None:
+    seen: list[str] = []
+
+    def work(forge: str, ctxs: list[GenerationContext]) -> None:
+        seen.extend(ctx.target for ctx in ctxs)
+
+    first = _scheduler(tmp_path, SchedulerLimits()).run([_target("m:a"), _target("m:b")], work)
+    assert first.completed == ["m:a", "m:b"]
+
+    seen.clear()
+    targets = [_target("m:a"), _target("m:b", fingerprint="v2"), _target("m:c")]
+    second = _scheduler(tmp_path, SchedulerLimits(), resume=True).run(targets, work)
+
+    assert second.skipped == ["m:a"]
+    assert sorted(seen) == ["m:b", "m:c"]
+
+
+def test_resume_reruns_targets_completed_with_another_mode_or_forge(tmp_path: Path) -> None:
+    seen: list[str] = []
+
+    def work(forge: str, ctxs: list[GenerationContext]) -> None:
+        seen.extend(ctx.target for ctx in ctxs)
+
+    _scheduler(tmp_path, SchedulerLimits()).run([_target("m:a"), _target("m:b")], work)
+
+    seen.clear()
+    targets = [_target("m:a", mode="run"), _target("m:b", forge="unit")]
+    summary = _scheduler(tmp_path, SchedulerLimits(), resume=True).run(targets, work)
+
+    assert summary.skipped == []
+    assert sorted(seen) == ["m:a", "m:b"]
+
+
+def test_corrupt_checkpoint_is_reported_and_ignored(tmp_path: Path) -> None:
+    (tmp_path / "checkpoint.json").write_text("{not json")
+    messages: list[str] = []
+
+    scheduler = BudgetScheduler(
+        SchedulerLimits(), tmp_path / "checkpoint.json", resume=True, report=messages.append
+    )
+    summary = scheduler.run([_target("m:a")], lambda forge, ctxs: None)
+
+    assert summary.completed == ["m:a"]
+    assert messages[0].startswith("Ignoring unreadable checkpoint")
+
+
+def test_failed_targets_are_prioritized_next_run(tmp_path: Path) -> None:
+    def fail_b(forge: str, ctxs: list[GenerationContext]) -> None:
+        if ctxs[0].target == "m:b":
+            raise SystemExit(3)
+
+    summary = _scheduler(tmp_path, SchedulerLimits()).run([_target("m:a"), _target("m:b")], fail_b)
+    assert summary.failed == ["m:b"]
+    assert summary.exit_code == 3
+
+    scheduler = _scheduler(tmp_path, SchedulerLimits())
+    ordered = scheduler.prioritize([_target("m:a"), _target("m:b"), _target("m:new")])
+
+    assert [t.ctx.target for t in ordered] == ["m:b", "m:new", "m:a"]
+
+
+def test_token_budget_leaves_remaining_targets_pending(tmp_path: Path) -> None:
+    targets = [_target(f"m:{name}", tokens=40) for name in "abc"]
+
+    summary = _scheduler(tmp_path, SchedulerLimits(max_tokens=100)).run(
+        targets, lambda forge, ctxs: None
+    )
+
+    assert summary.completed == ["m:a", "m:b"]
+    assert summary.pending == ["m:c"]
+
+
+def _request_once(forge: str, ctxs: list[GenerationContext]) -> None:
+    """Work that makes one request per unit, as a batched generation does."""
+    try:
+        ctxs[0].generate_text("prompt")
+    except RateLimitDeadlineError:
+        raise
+    except RuntimeError:
+        pass  # LLM integration is not implemented; the request was still rate limited.
+
+
+def test_request_rate_limit_waits_for_window(tmp_path: Path) -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    scheduler = _scheduler(
+        tmp_path,
+        SchedulerLimits(max_requests_per_minute=2),
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+
+    summary = scheduler.run([_target(f"m{n}:f") for n in "abc"], _request_once)
+
+    assert len(summary.completed) == 3
+    assert sleeps == [60.0]
+
+
+def test_rate_limit_counts_requests_made_not_batch_targets(tmp_path: Path) -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    scheduler = _scheduler(
+        tmp_path,
+        SchedulerLimits(max_requests_per_minute=2),
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+    targets = [_target(f"m:{n}", batch_size=4, candidates=3) for n in "abcd"]
+
+    summary = scheduler.run(targets, _request_once)
+
+    assert len(summary.completed) == 4
+    assert sleeps == []
+
+
+def test_rate_limit_does_not_sleep_past_time_budget(tmp_path: Path) -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    scheduler = _scheduler(
+        tmp_path,
+        SchedulerLimits(max_requests_per_minute=1, time_budget=30),
+        clock=lambda: now[0],
+        sleep=sleeps.append,
+    )
+
+    summary = scheduler.run([_target("ma:f"), _target("mb:f")], _request_once)
+
+    assert sleeps == []
+    assert summary.completed == ["ma:f"]
+    assert summary.pending == ["mb:f"]
+    assert summary.exit_code == 0
+
+
+def test_units_run_concurrently_up_to_limit(tmp_path: Path) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def work(forge: str, ctxs: list[GenerationContext]) -> None:
+        barrier.wait()
+
+    summary = _scheduler(tmp_path, SchedulerLimits(max_concurrency=2)).run(
+        [_target("m:a"), _target("m:b")], work
+    )
+
+    assert sorted(summary.completed) == ["m:a", "m:b"]
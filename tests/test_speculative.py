@@ -0,0 +1,87 @@
+"""Tests for speculative multi-candidate generation."""
+
+import threading
+import time
+
+import pytest
+
+from carron.core.ratelimit import RateLimiter
+from carron.core.types import CandidateRejectedError, GenerationContext
+from carron.runner.collect import check_collectable
+
+_GOOD = "import os\n\n\ndef test_ok():\n    assert os.sep\n"
+
+
+class _CandidateContext(GenerationContext):
+    """Context replaying a fixed sequence of (delay, text) candidates."""
+
+    def __init__(self, replies: list[tuple[float, str]], *, candidates: int) -> None:
+        super().__init__(
+            "mod:f",
+            target_info=None,
+            resolved_target=None,
+            candidates=candidates,
+            candidate_validator=check_collectable,
+        )
+        self._replies = iter(replies)
+        self._lock = threading.Lock()
+
+    def generate_text(self, prompt: str) -> str:
+        with self._lock:
+            delay, text = next(self._replies)
+        time.sleep(delay)
+        return text
+
+
+def test_check_collectable_accepts_valid_tests() -> None:
+    assert check_collectable(_GOOD) == []
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "def test_bad(:\n    pass\n",
+        "import carron_missing_module_xyz\n\n\ndef test_x():\n    pass\n",
+        "def helper():\n    return 1\n",
+    ],
+)
+def test_check_collectable_reports_problems(source: str) -> None:
+    assert check_collectable(source)
+
+
+def test_first_valid_candidate_wins() -> None:
+    ctx = _CandidateContext(
+        [(0.0, "def test_bad(:\n"), (0.2, _GOOD.replace("ok", "slow")), (0.05, _GOOD)],
+        candidates=3,
+    )
+
+    assert ctx.generate_validated_text("prompt") == _GOOD
+
+
+def test_all_invalid_candidates_raise() -> None:
+    ctx = _CandidateContext([(0.0, "x = 1\n"), (0.0, "def test_bad(:\n")], candidates=2)
+
+    with pytest.raises(CandidateRejectedError):
+        ctx.generate_validated_text("prompt")
+
+
+def test_every_candidate_request_waits_for_the_rate_limiter() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    ctx = GenerationContext(
+        "mod:f",
+        target_info=None,
+        resolved_target=None,
+        candidates=3,
+        candidate_validator=check_collectable,
+        rate_limiter=RateLimiter(2, clock=lambda: now[0], sleep=sleep),
+    )
+
+    with pytest.raises(CandidateRejectedError):
+        ctx.generate_validated_text("prompt")
+
+    assert sleeps == [60.0]